@@ -67,11 +67,13 @@ import itertools
 import json
 import os
 import sys
+from collections import deque
 from collections.abc import Callable, Iterable, Mapping, Sequence
 from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime
-from typing import IO, TYPE_CHECKING, Optional, Tuple
+from functools import cache
+from typing import IO, TYPE_CHECKING, Any, Optional, Tuple
 
 from dotenv import load_dotenv
 
@@ -205,11 +207,17 @@ def ensure_link_protocol(link: str) -> str:
     return link if link.startswith("https://") else f"https://{link}"
 
 
-# Apply replacements to a string to ensure it uses canonical names.
-def canonicalise(replacements: Mapping[str, str], value: str) -> str:
-    for target, replacement in replacements.items():
-        value = value.replace(target, replacement)
-    return value
+# Build a function applying replacements to a string to ensure it uses
+# canonical names. Replacements are applied in order, each to the result of the
+# ones before it. Results are cached as the same games come up repeatedly.
+def canonicaliser(replacements: Mapping[str, str]) -> Callable[[str], str]:
+    @cache
+    def canonicalise(value: str) -> str:
+        for target, replacement in replacements.items():
+            value = value.replace(target, replacement)
+        return value
+
+    return canonicalise
 
 
 # Obtain spreadsheet data using the google drive API.
@@ -235,9 +243,6 @@ class AdditionalRow:
         yield "guest", self.guest
 
 
-empty_additional_stream_row = AdditionalRow([])
-
-
 @dataclass
 class Row:
     stream_index: int
@@ -247,7 +252,7 @@ class Row:
     igdb_slug: str | None
     game_index: int | None
     vods: Mapping[str, str]
-    additional: AdditionalRow
+    additional: AdditionalRow | None
 
     def as_arguments(
         self, multipart_streams: Mapping[int, int], color: Callable[[str], str]
@@ -264,7 +269,8 @@ class Row:
         yield "game_index", str(self.game_index) if self.game_index else None
         yield "vod", self.vods
         yield "color", color(self.game)
-        yield from self.additional.as_arguments()
+        if self.additional is not None:
+            yield from self.additional.as_arguments()
 
 
 # Get an int from a string.
@@ -282,16 +288,23 @@ def numerical(value: str | None) -> int | None:
                 raise
 
 
+# Turn a date from the spreadsheet's format into an ISO 8601 one. Multi-part
+# streams share a date, so parsed dates are cached.
+@cache
+def standardise_date(date: str) -> str:
+    return datetime.strptime(date, "%a, %m/%d/%Y").strftime("%Y-%m-%d")
+
+
 # Read CSV data in and create a map in a standard format for it.
 def read_and_standardise(
     file: IO,
     gameResolver: GameResolver,
     skip_rows: int = 0,
-    replacements: Mapping[str, str] | None = None,
+    canonicalise: Callable[[str], str] | None = None,
     additional_stream_data: Mapping[int, AdditionalRow] | None = None,
 ) -> Iterable[Row]:
-    if replacements is None:
-        replacements = {}
+    if canonicalise is None:
+        canonicalise = canonicaliser({})
     if additional_stream_data is None:
         additional_stream_data = {}
     reader = csv.reader(file, delimiter=",")
@@ -317,14 +330,11 @@ def read_and_standardise(
             if (not index and date) or game == "(Today)":
                 continue
 
-            vods = {
-                key: ensure_link_protocol(value)
-                for (key, value) in [
-                    ("with_chat", vod_with_chat),
-                    ("without_chat", vod_without_chat),
-                ]
-                if value
-            }
+            vods: dict[str, str] = {}
+            if vod_with_chat:
+                vods["with_chat"] = ensure_link_protocol(vod_with_chat)
+            if vod_without_chat:
+                vods["without_chat"] = ensure_link_protocol(vod_without_chat)
 
             current_index = int(index, 10) if index else previous_index
             current_date = date if date else previous_date
@@ -349,15 +359,14 @@ def read_and_standardise(
             if current_host:
                 continue
 
-            additional = additional_stream_data.get(
-                current_index, empty_additional_stream_row
-            )
+            # Most streams have no additional data.
+            additional = additional_stream_data.get(current_index)
 
             row = Row(
                 current_index,
-                datetime.strptime(current_date, "%a, %m/%d/%Y").strftime("%Y-%m-%d"),
+                standardise_date(current_date),
                 part,
-                canonicalise(replacements, game),
+                canonicalise(game),
                 None,
                 numerical(game_index),
                 vods,
@@ -389,36 +398,61 @@ def stable_hash(key: str) -> int:
 
 
 # Get a color using the hash of the string, giving the same color each time as
-# long as the length of the color list doesn't change.
+# long as the length of the color list doesn't change. Colors are cached so
+# each name is only hashed once.
 def color_picker(colors: Sequence[str]) -> Callable[[str], str]:
     max = len(colors)
 
+    @cache
     def color_for_name(name: str) -> str:
         return colors[stable_hash(name) % max]
 
     return color_for_name
 
 
+# Turn a map into template arguments, suffixing them with the map's keys.
+def mapping_template_arguments(key: str, value: Mapping[str, str]) -> Iterable[str]:
+    for subkey, subvalue in value.items():
+        yield f"{key}_{subkey}={subvalue}"
+
+
+# Turn a list into template arguments, indexing them. A single string is
+# treated as one value rather than split into characters.
+def list_template_arguments(key: str, value: str | Iterable[str]) -> Iterable[str]:
+    if isinstance(value, str):
+        yield f"{key}={value}"
+        return
+    for index, subvalue in enumerate(value):
+        index_str = f"{index + 1}" if index > 0 else ""
+        yield f"{key}{index_str}={subvalue}"
+
+
+# Turn a single value into a template argument.
+def scalar_template_argument(key: str, value: str) -> Iterable[str]:
+    return (f"{key}={value}",)
+
+
+# The arguments that aren't single values, and how to format them. Anything
+# not listed here is formatted with scalar_template_argument.
+TEMPLATE_ARGUMENT_FORMATTERS: Mapping[str, Callable[[str, Any], Iterable[str]]] = {
+    "vod": mapping_template_arguments,
+    "guest": list_template_arguments,
+}
+
+
 # Turn the value into template arguments, if there are multiple, indexing
 # them (for lists) or suffixing them (for maps).
 def as_template_argument(
     key: str, value: str | Mapping[str, str] | Iterable[str]
 ) -> Iterable[str]:
-    if isinstance(value, Mapping):
-        for subkey, subvalue in value.items():
-            yield f"{key}_{subkey}={subvalue}"
-    elif not isinstance(value, str) and isinstance(value, Iterable):
-        for index, subvalue in enumerate(value):
-            index_str = f"{index + 1}" if index > 0 else ""
-            yield f"{key}{index_str}={subvalue}"
-    else:
-        yield f"{key}={value}"
+    formatter = TEMPLATE_ARGUMENT_FORMATTERS.get(key, scalar_template_argument)
+    return formatter(key, value)
 
 
 # Generate wikitext given the standardised rows from the CSV.
 def generate_wiki_source(
     data_source_id: str,
-    rows: Sequence[Row],
+    rows: Iterable[Row],
     colors: Sequence[str],
 ):
     data_source_url = f"https://docs.google.com/spreadsheets/d/{data_source_id}"
@@ -433,11 +467,16 @@ def generate_wiki_source(
     )
     attributions = ", ".join([data_attribution, script_attribution])
 
-    multipart_streams = {row.stream_index for row in rows if row.part > 1}
-    last_parts = {
-        index: max(row.part for row in rows if row.stream_index == index)
-        for index in multipart_streams
-    }
+    # Collect the rows newest first and find the last part of each multi-part
+    # stream in a single pass.
+    newest_first: deque[Row] = deque()
+    last_parts: dict[int, int] = {}
+    for row in rows:
+        newest_first.appendleft(row)
+        if row.part > 1:
+            last_parts[row.stream_index] = max(
+                row.part, last_parts.get(row.stream_index, 0)
+            )
 
     color_for_name = color_picker(colors)
 
@@ -450,14 +489,12 @@ def generate_wiki_source(
     yield "! # !! Date !! Game !! No. in Series !! Available VODs"
     yield ""
 
-    for row in reversed(rows):
-        arguments = "|".join(
-            itertools.chain.from_iterable(
-                as_template_argument(key, value)
-                for (key, value) in row.as_arguments(last_parts, color_for_name)
-                if value
-            )
-        )
+    for row in newest_first:
+        template_arguments: list[str] = []
+        for key, value in row.as_arguments(last_parts, color_for_name):
+            if value:
+                template_arguments.extend(as_template_argument(key, value))
+        arguments = "|".join(template_arguments)
         yield f"  {{{{StreamIndexEntry|{arguments}}}}}"
 
     yield "|}"
@@ -645,26 +682,26 @@ if __name__ == "__main__":
         if not quiet:
             print(f"Written source data to “{input_file}”.")
 
-    with open(input_file, "r") as file:
-        rows = list(
-            read_and_standardise(
-                file,
-                gameResolver,
-                int(arguments["--skip-rows"], base=10),
-                replacements,
-                additional_stream_data,
-            )
+    # The csv module needs newline translation disabled to handle line breaks
+    # inside quoted cells, and a large buffer means fewer reads for the sheet.
+    with open(input_file, "r", buffering=1 << 20, newline="") as file:
+        rows = read_and_standardise(
+            file,
+            gameResolver,
+            int(arguments["--skip-rows"], base=10),
+            canonicaliser(replacements),
+            additional_stream_data,
         )
-
-    wikitext_lines = generate_wiki_source(data_source_id, rows, colors)
-    wikitext = "\n".join(wikitext_lines)
+        wikitext_lines = generate_wiki_source(data_source_id, rows, colors)
+        wikitext = "\n".join(wikitext_lines)
 
     if quiet:
         print(wikitext)
     else:
         print(f"Written wikitext to “{output_file}”.")
         with open_overwrite(output_file, arguments, "--overwrite-output") as file:
-            file.write(f"{wikitext}\n")
+            file.write(wikitext)
+            file.write("\n")
 
     if update_wiki:
         if auth is None: